@@ -2,10 +2,12 @@ from typing import Dict
 from datetime import datetime, timedelta
 from pathlib import Path
 import json
+import time
 
 from ..tools.availability_tool import get_availability
 from ..tools.booking_tool import book_slot
 from ..rag.faq_rag import answer_faq, initialize_faq_index
+from ..audit.event_log import log_event
 
 # load FAQ DB
 try:
@@ -55,6 +57,26 @@ def get_mock_today() -> datetime.date:
     return datetime.now().date()
 
 
+# ---------------------------------------------------------
+# Tool calls (recorded in the event log)
+# ---------------------------------------------------------
+def _call_tool(session_id: str, name: str, fn, *args, log_fields: Dict = None):
+    """
+    Run a tool and log its name, outcome and duration. Raw arguments are never
+    logged (they may carry patient details); callers pass the non-identifying
+    fields worth recording in `log_fields`.
+    """
+    start = time.perf_counter()
+    ok = False
+    try:
+        result = fn(*args)
+        ok = True
+        return result
+    finally:
+        log_event("tool_call", session_id=session_id, tool=name, ok=ok,
+                  duration_ms=round((time.perf_counter() - start) * 1000, 3), **(log_fields or {}))
+
+
 # ---------------------------------------------------------
 # FAQ SUPPORT
 # ---------------------------------------------------------
@@ -167,7 +189,8 @@ def handle_message(session_id: str, message: str) -> Dict:
             # default appointment type
             appt_type = "consultation"
             try:
-                avail = get_availability(date_str, appt_type)
+                avail = _call_tool(session_id, "get_availability", get_availability, date_str, appt_type,
+                                   log_fields={"date": date_str, "appointment_type": appt_type})
             except Exception as e:
                 return {"type": "error", "response": f"Could not check availability: {str(e)}"}
 
@@ -190,7 +213,8 @@ def handle_message(session_id: str, message: str) -> Dict:
                 # fallback for no slots — use next day suggestions per PDF
                 try:
                     next_day = (datetime.strptime(date_str, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
-                    next_avail = get_availability(next_day, appt_type)
+                    next_avail = _call_tool(session_id, "get_availability", get_availability, next_day, appt_type,
+                                            log_fields={"date": next_day, "appointment_type": appt_type})
                     top_slots = [s for s in next_avail["available_slots"] if s["available"]][:3]
                     times = [s["start_time"] for s in top_slots]
                 except Exception:
@@ -263,7 +287,9 @@ def handle_message(session_id: str, message: str) -> Dict:
             }
         sess["data"]["preferred"] = date
         try:
-            avail = get_availability(date, sess["data"]["appointment_type"])
+            appt_type = sess["data"]["appointment_type"]
+            avail = _call_tool(session_id, "get_availability", get_availability, date, appt_type,
+                               log_fields={"date": date, "appointment_type": appt_type})
         except Exception as e:
             return {"type": "error", "response": f"Could not fetch availability: {str(e)}"}
 
@@ -323,10 +349,18 @@ def handle_message(session_id: str, message: str) -> Dict:
             "patient": {"name": name, "email": email, "phone": phone},
             "reason": sess["data"]["reason"]
         }
-        resp = book_slot(payload)
+        resp = _call_tool(session_id, "book_slot", book_slot, payload, log_fields={
+            "appointment_type": payload["appointment_type"],
+            "date": payload["date"],
+            "start_time": payload["start_time"],
+        })
 
         sess["state"] = "booked"
         sess["data"]["booking"] = resp
+        log_event("booking", session_id=session_id, booking_id=resp["booking_id"],
+                  confirmation_code=resp["confirmation_code"], status=resp["status"],
+                  appointment_type=payload["appointment_type"], date=payload["date"],
+                  start_time=payload["start_time"])
 
         return {
             "type": "confirmation",
@@ -0,0 +1,284 @@
+from fastapi import APIRouter
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Optional, Tuple
+import asyncio
+import json
+import math
+import os
+import time
+
+from ..agent.scheduling_agent import SESSIONS
+
+router = APIRouter(prefix="/api/metrics", tags=["metrics"])
+
+# Limits can be tuned per deployment through the environment (see .env.example)
+MAX_IN_FLIGHT = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", "16"))
+MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "64"))
+QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "2.0"))
+SESSION_RATE = float(os.getenv("ADMISSION_SESSION_RATE", "1.0"))
+SESSION_BURST = float(os.getenv("ADMISSION_SESSION_BURST", "5"))
+CLIENT_RATE = float(os.getenv("ADMISSION_CLIENT_RATE", "10.0"))
+CLIENT_BURST = float(os.getenv("ADMISSION_CLIENT_BURST", "30"))
+MAX_BODY_BYTES = int(os.getenv("ADMISSION_MAX_BODY_BYTES", str(64 * 1024)))
+
+# Turns in this state finish a booking, so they jump ahead of new sessions
+PRIORITY_STATES = {"awaiting_patient_info"}
+
+
+# ---------------------------------------------------------
+# Token buckets
+# ---------------------------------------------------------
+class TokenBucket:
+    """Classic token bucket: `rate` tokens/second, holding at most `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self) -> Tuple[bool, float]:
+        """Consume one token. Returns (allowed, seconds until a token is available)."""
+        now = time.monotonic()
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True, 0.0
+        return False, (1 - self.tokens) / self.rate
+
+
+class BucketRegistry:
+    """
+    Keyed token buckets kept in least-recently-used order. Once `max_keys`
+    buckets exist, the stalest one is evicted, so memory stays bounded.
+    """
+
+    def __init__(self, rate: float, capacity: float, max_keys: int = 10000):
+        self.rate = rate
+        self.capacity = capacity
+        self.max_keys = max_keys
+        self.buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+
+    def take(self, key: str) -> Tuple[bool, float]:
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            if len(self.buckets) >= self.max_keys:
+                self.buckets.popitem(last=False)
+            bucket = self.buckets[key] = TokenBucket(self.rate, self.capacity)
+        else:
+            self.buckets.move_to_end(key)
+        return bucket.take()
+
+
+# ---------------------------------------------------------
+# Admission controller
+# ---------------------------------------------------------
+class AdmissionController:
+    """
+    Caps in-flight requests and queues the overflow in two FIFO lanes
+    (priority / normal). Waiters that exceed `queue_timeout`, or arrive when
+    the queue is full, are shed instead of piling up in the threadpool.
+    """
+
+    def __init__(self, max_in_flight: int = MAX_IN_FLIGHT, max_queue: int = MAX_QUEUE,
+                 queue_timeout: float = QUEUE_TIMEOUT,
+                 session_rate: float = SESSION_RATE, session_burst: float = SESSION_BURST,
+                 client_rate: float = CLIENT_RATE, client_burst: float = CLIENT_BURST):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.session_buckets = BucketRegistry(session_rate, session_burst)
+        self.client_buckets = BucketRegistry(client_rate, client_burst)
+        self.in_flight = 0
+        self.queues: Dict[str, Deque[asyncio.Future]] = {"priority": deque(), "normal": deque()}
+        self.admitted = 0
+        self.shed = {"rate_limited_session": 0, "rate_limited_client": 0,
+                     "body_too_large": 0, "queue_full": 0, "queue_timeout": 0}
+
+    def queue_depth(self) -> int:
+        return sum(len(q) for q in self.queues.values())
+
+    def check_client(self, client: str) -> Optional[float]:
+        """Returns retry_after when the client's bucket is empty, else None."""
+        ok, wait = self.client_buckets.take(client)
+        if not ok:
+            self.shed["rate_limited_client"] += 1
+            return wait
+        return None
+
+    def check_session(self, session_id: Optional[str]) -> Optional[float]:
+        """Returns retry_after when the session's bucket is empty, else None."""
+        if not session_id:
+            return None
+        ok, wait = self.session_buckets.take(session_id)
+        if not ok:
+            self.shed["rate_limited_session"] += 1
+            return wait
+        return None
+
+    async def acquire(self, priority: bool) -> Optional[str]:
+        """Wait for an execution slot. Returns a shed reason, or None once admitted."""
+        if self.in_flight < self.max_in_flight and not self.queue_depth():
+            self.in_flight += 1
+            self.admitted += 1
+            return None
+        if self.queue_depth() >= self.max_queue:
+            self.shed["queue_full"] += 1
+            return "queue_full"
+
+        lane = self.queues["priority" if priority else "normal"]
+        waiter = asyncio.get_running_loop().create_future()
+        lane.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if waiter.done():
+                # slot was handed over just as the deadline hit: keep it
+                self.admitted += 1
+                return None
+            waiter.cancel()
+            lane.remove(waiter)
+            self.shed["queue_timeout"] += 1
+            return "queue_timeout"
+        except asyncio.CancelledError:
+            # client went away while queued: give back a slot we may have been handed
+            if waiter.done():
+                self.release()
+            else:
+                waiter.cancel()
+                lane.remove(waiter)
+            raise
+        self.admitted += 1
+        return None
+
+    def release(self):
+        """Hand the freed slot straight to the next waiter, priority lane first."""
+        for lane in (self.queues["priority"], self.queues["normal"]):
+            while lane:
+                waiter = lane.popleft()
+                if not waiter.done():
+                    waiter.set_result(None)
+                    return
+        self.in_flight -= 1
+
+    def retry_after(self) -> int:
+        """Rough estimate of when capacity frees up, for the Retry-After header."""
+        return max(1, math.ceil(self.queue_timeout))
+
+    def metrics(self) -> Dict:
+        return {
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "queue_depth": self.queue_depth(),
+            "queue_depth_priority": len(self.queues["priority"]),
+            "queue_depth_normal": len(self.queues["normal"]),
+            "admitted": self.admitted,
+            "shed": dict(self.shed),
+            "shed_total": sum(self.shed.values()),
+        }
+
+
+# ---------------------------------------------------------
+# ASGI middleware
+# ---------------------------------------------------------
+class AdmissionMiddleware:
+    """
+    Pure ASGI middleware guarding the chat endpoint. It charges the client's
+    token bucket, buffers the (size-capped) request body to read `session_id`
+    and replays it downstream, charges the session's bucket, then waits for a
+    slot from the controller.
+    """
+
+    def __init__(self, app, controller: AdmissionController, paths=("/api/chat",),
+                 max_body_bytes: int = MAX_BODY_BYTES):
+        self.app = app
+        self.controller = controller
+        self.paths = set(paths)
+        self.max_body_bytes = max_body_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        client = scope["client"][0] if scope.get("client") else "unknown"
+        wait = self.controller.check_client(client)
+        if wait is not None:
+            await _reject(send, 429, "rate_limited_client", max(1, math.ceil(wait)))
+            return
+
+        body = b""
+        more = True
+        while more:
+            message = await receive()
+            body += message.get("body", b"")
+            more = message.get("more_body", False)
+            if len(body) > self.max_body_bytes:
+                self.controller.shed["body_too_large"] += 1
+                await _reject(send, 413, "body_too_large")
+                return
+
+        session_id = _session_id_from_body(body)
+        wait = self.controller.check_session(session_id)
+        if wait is not None:
+            await _reject(send, 429, "rate_limited_session", max(1, math.ceil(wait)))
+            return
+
+        state = SESSIONS.get(session_id, {}).get("state") if session_id else None
+        reason = await self.controller.acquire(priority=state in PRIORITY_STATES)
+        if reason:
+            await _reject(send, 503, reason, self.controller.retry_after())
+            return
+
+        replayed = False
+
+        async def replay():
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        try:
+            await self.app(scope, replay, send)
+        finally:
+            self.controller.release()
+
+
+def _session_id_from_body(body: bytes) -> Optional[str]:
+    try:
+        sid = json.loads(body or b"{}").get("session_id")
+    except (ValueError, AttributeError):
+        return None
+    return sid if isinstance(sid, str) and sid else None
+
+
+_REJECT_DETAIL = {
+    413: "Request body too large",
+    429: "Too many requests",
+    503: "Server busy, please retry",
+}
+
+
+async def _reject(send, status: int, reason: str, retry_after: Optional[int] = None):
+    payload = json.dumps({"detail": _REJECT_DETAIL[status], "reason": reason}).encode()
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(payload)).encode()),
+    ]
+    if retry_after is not None:
+        headers.append((b"retry-after", str(retry_after).encode()))
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": payload})
+
+
+controller = AdmissionController()
+
+
+@router.get("/admission")
+def admission_metrics():
+    return controller.metrics()
@@ -4,6 +4,8 @@ import json
 from pathlib import Path
 from datetime import datetime, timedelta
 
+from ..audit.event_log import log_event
+
 router = APIRouter(prefix="/api/calendly", tags=["calendly"])
 
 SCHEDULE_FILE = Path("data/doctor_schedule.json")
@@ -76,6 +78,8 @@ def book_appointment(payload: dict):
     schedule.setdefault("existing_appointments", []).append(new_appt)
     with open(SCHEDULE_FILE, "w") as f:
         json.dump(schedule, f, indent=2)
+    log_event("booking", source="calendly_api", booking_id=booking_id, status="confirmed",
+              appointment_type=appt_type, date=date, start_time=start_time)
     return {
         "booking_id": booking_id,
         "status": "confirmed",
@@ -1,19 +1,40 @@
 from fastapi import APIRouter
 from ..models.schemas import ChatRequest
-from ..agent.scheduling_agent import handle_message
+from ..agent.scheduling_agent import handle_message, SESSIONS
+from ..audit.event_log import log_event
+import time
 import uuid
 
 router = APIRouter(prefix="/api", tags=["chat"])
 
+# Turns in these states carry patient details (name, email, phone)
+_REDACTED_STATES = {"awaiting_patient_info"}
+
+
+def _loggable_message(state: str, message: str) -> str:
+    return "[redacted: patient details]" if state in _REDACTED_STATES else message
+
+
 @router.post("/chat")
 def chat_endpoint(req: ChatRequest):
+    session_id = req.session_id or str(uuid.uuid4())
+    state_before = SESSIONS.get(session_id, {}).get("state", "new")
+    start = time.perf_counter()
     try:
-        session_id = req.session_id or str(uuid.uuid4())
         result = handle_message(session_id, req.message)
-        return {"session_id": session_id, "result": result}
     except Exception as e:
-        print("Error in handle_message:", e)  # <-- see the real error in backend terminal
+        log_event("error", session_id=session_id, state=state_before,
+                  error=repr(e), message=_loggable_message(state_before, req.message))
         return {
             "session_id": req.session_id,
             "result": {"response": "Server error occurred.", "type": "text"}
         }
+
+    state_after = SESSIONS.get(session_id, {}).get("state", state_before)
+    log_event("turn", session_id=session_id, message=_loggable_message(state_before, req.message),
+              response_type=result.get("type"), response=result.get("response"),
+              latency_ms=round((time.perf_counter() - start) * 1000, 3))
+    if state_after != state_before:
+        log_event("state_transition", session_id=session_id,
+                  from_state=state_before, to_state=state_after)
+    return {"session_id": session_id, "result": result}
@@ -0,0 +1,214 @@
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+import json
+import os
+import queue
+import threading
+import time
+
+# Tunable through the environment (see .env.example)
+LOG_DIR = Path(os.getenv("AUDIT_LOG_DIR", "data/logs"))
+MAX_BYTES = int(os.getenv("AUDIT_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+BACKUP_COUNT = int(os.getenv("AUDIT_LOG_BACKUPS", "5"))
+QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+QUEUE_POLICY = os.getenv("AUDIT_QUEUE_POLICY", "drop")  # "drop" or "block"
+BLOCK_TIMEOUT = float(os.getenv("AUDIT_BLOCK_TIMEOUT", "1.0"))
+BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "256"))
+
+_STOP = object()
+
+
+class EventLog:
+    """
+    Structured event log (turns, state transitions, tool calls, bookings).
+
+    `emit` only timestamps the event and puts it on a bounded queue, so request
+    handlers never touch the disk. A background thread drains the queue in
+    batches and appends them as NDJSON to `<dir>/events.ndjson`, rotating to
+    `events.ndjson.1 .. .N` once the file passes `max_bytes`.
+
+    When the queue is full, policy "drop" discards the event (counted in
+    `stats()`), while "block" waits up to `block_timeout` seconds for room.
+
+    The writer starts on first use (or `start()`). After `close()` the log
+    refuses new events, counting them as dropped, until `start()` is called again.
+    """
+
+    def __init__(self, log_dir: Path = LOG_DIR, max_bytes: int = MAX_BYTES,
+                 backup_count: int = BACKUP_COUNT, queue_size: int = QUEUE_SIZE,
+                 policy: str = QUEUE_POLICY, block_timeout: float = BLOCK_TIMEOUT,
+                 batch_size: int = BATCH_SIZE):
+        if policy not in ("drop", "block"):
+            raise ValueError("policy must be 'drop' or 'block'")
+        self.path = Path(log_dir) / "events.ndjson"
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.batch_size = batch_size
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        # signalled when the last in-progress emit finishes, so close() can wait for it
+        self._idle = threading.Condition(self._lock)
+        self._emitting = 0
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._file = None
+        self._stats_lock = threading.Lock()
+        self.written = 0
+        self.dropped = 0
+        self.write_errors = 0
+
+    # -------------------------
+    # producer side
+    # -------------------------
+    def emit(self, event_type: str, **fields):
+        """Queue one event. Never raises and never does file I/O."""
+        if self._thread is None:
+            self._ensure_writer()
+        with self._lock:
+            closed = self._closed
+            if not closed:
+                self._emitting += 1
+        if closed:
+            self._count(dropped=1)
+            return
+        event = {"ts": datetime.now(timezone.utc).isoformat(), "event": event_type, **fields}
+        try:
+            if self.policy == "block":
+                self._queue.put(event, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(event)
+        except queue.Full:
+            self._count(dropped=1)
+        finally:
+            with self._lock:
+                self._emitting -= 1
+                if not self._emitting:
+                    self._idle.notify_all()
+
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            return {"queued": self._queue.qsize(), "written": self.written,
+                    "dropped": self.dropped, "write_errors": self.write_errors}
+
+    def _count(self, written: int = 0, dropped: int = 0, write_errors: int = 0):
+        # bumped from request threads and the writer thread alike
+        with self._stats_lock:
+            self.written += written
+            self.dropped += dropped
+            self.write_errors += write_errors
+
+    # -------------------------
+    # lifecycle
+    # -------------------------
+    def start(self):
+        """Start the writer, reopening the log if it was closed."""
+        with self._lock:
+            self._closed = False
+        self._ensure_writer()
+
+    def _ensure_writer(self):
+        with self._lock:
+            if self._thread is not None or self._closed:
+                return
+            self._thread = threading.Thread(target=self._run, name="event-log-writer", daemon=True)
+            self._thread.start()
+
+    def close(self, timeout: float = 5.0):
+        """
+        Stop accepting events, flush everything queued and stop the writer.
+        Returns within roughly `timeout` seconds even if the writer is stuck.
+        """
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            self._closed = True
+            # emits that got past the closed check finish their put before the stop marker
+            self._idle.wait_for(lambda: not self._emitting, timeout)
+            thread = self._thread
+        if thread is not None:
+            try:
+                self._queue.put(_STOP, timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Full:
+                return  # writer is stuck on the disk with a full queue; leave it be
+            thread.join(max(0.0, deadline - time.monotonic()))
+            if thread.is_alive():
+                return  # writer is stuck on the disk; leave the file to it
+        with self._lock:
+            self._thread = None
+        # the writer is gone: write anything still queued from here
+        leftover = []
+        while True:
+            try:
+                leftover.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        self._write([e for e in leftover if e is not _STOP])
+        self._close_file()
+
+    # -------------------------
+    # writer thread
+    # -------------------------
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if _STOP in batch:
+                stopping = True
+                batch = [e for e in batch if e is not _STOP]
+            self._write(batch)
+        self._close_file()
+
+    def _write(self, batch: List[Dict]):
+        if not batch:
+            return
+        try:
+            lines = "".join(json.dumps(e, default=str) + "\n" for e in batch)
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(lines)
+            self._file.flush()
+            self._count(written=len(batch))
+            if self._file.tell() >= self.max_bytes:
+                self._rotate()
+        except Exception:
+            # a broken disk or odd payload must not take the writer thread down with it
+            self._count(write_errors=1, dropped=len(batch))
+
+    def _rotate(self):
+        self._close_file()
+        for i in range(self.backup_count - 1, 0, -1):
+            src = self.path.with_name(f"{self.path.name}.{i}")
+            if src.exists():
+                src.replace(self.path.with_name(f"{self.path.name}.{i + 1}"))
+        if self.backup_count > 0:
+            self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+event_log = EventLog()
+
+
+def log_event(event_type: str, **fields):
+    event_log.emit(event_type, **fields)
+
+
+def start_event_log():
+    event_log.start()
+
+
+def close_event_log():
+    event_log.close()
@@ -1,5 +1,6 @@
 from fastapi import FastAPI
-from backend.api import chat, calendly_integration
+from backend.api import chat, calendly_integration, admission
+from backend.audit.event_log import start_event_log, close_event_log
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
@@ -7,14 +8,29 @@ app = FastAPI(title="Appointment Scheduling Agent")
 
 app.include_router(chat.router)
 app.include_router(calendly_integration.router)
+app.include_router(admission.router)
+
+# Admission control sits inside CORS so shed responses still carry CORS headers
+app.add_middleware(admission.AdmissionMiddleware, controller=admission.controller)
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_methods=["*"],
-    allow_headers=["*"]
+    allow_headers=["*"],
+    # let the browser client read the back-off hint on 429/503 responses
+    expose_headers=["Retry-After"]
 )
 
+@app.on_event("startup")
+def on_startup():
+    start_event_log()
+
+@app.on_event("shutdown")
+def on_shutdown():
+    # drain queued events to disk before the process exits
+    close_event_log()
+
 @app.get("/")
 def read_root():
     return {"message": "Appointment Scheduling Agent is running."}
@@ -0,0 +1,13 @@
+import pytest
+
+from backend.audit import event_log as event_log_module
+from backend.audit.event_log import EventLog
+
+
+@pytest.fixture(autouse=True)
+def event_log(tmp_path, monkeypatch):
+    """Route every test's events to a throwaway log instead of data/logs."""
+    log = EventLog(log_dir=tmp_path / "logs")
+    monkeypatch.setattr(event_log_module, "event_log", log)
+    yield log
+    log.close()
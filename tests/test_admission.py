@@ -0,0 +1,189 @@
+import asyncio
+import os
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from backend.api import admission
+from backend.api.admission import (
+    AdmissionController, AdmissionMiddleware, BucketRegistry, TokenBucket,
+)
+
+SERVICE_TIME = 0.05
+THREADPOOL_SIZE = 8
+
+
+def make_app(controller=None, **options):
+    """Slow chat endpoint, guarded by the middleware unless `controller` is None."""
+    app = FastAPI()
+
+    @app.post("/api/chat")
+    def slow_chat(payload: dict):
+        time.sleep(SERVICE_TIME)  # stands in for a blocking agent turn
+        return {"ok": True}
+
+    if controller is not None:
+        app.add_middleware(AdmissionMiddleware, controller=controller, **options)
+    return app
+
+
+def test_token_bucket_refills():
+    bucket = TokenBucket(rate=100.0, capacity=2)
+    assert bucket.take()[0]
+    assert bucket.take()[0]
+    ok, wait = bucket.take()
+    assert not ok and 0 < wait <= 0.01
+    time.sleep(0.02)
+    assert bucket.take()[0]
+
+
+def test_session_rate_limit_returns_429():
+    controller = AdmissionController(session_rate=0.1, session_burst=2)
+    app = make_app(controller)
+
+    async def run():
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            return [await client.post("/api/chat", json={"message": "hi", "session_id": "s1"})
+                    for _ in range(3)]
+
+    responses = asyncio.run(run())
+    assert [r.status_code for r in responses] == [200, 200, 429]
+    assert int(responses[-1].headers["retry-after"]) >= 1
+    assert controller.metrics()["shed"]["rate_limited_session"] == 1
+
+
+def test_priority_turns_jump_the_queue():
+    controller = AdmissionController(max_in_flight=1, queue_timeout=5, client_burst=100)
+    admission.SESSIONS["booking"] = {"state": "awaiting_patient_info", "data": {}}
+    app = make_app(controller)
+    order = []
+
+    async def send(client, session_id):
+        await client.post("/api/chat", json={"message": "x", "session_id": session_id})
+        order.append(session_id)
+
+    async def run():
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            first = asyncio.create_task(send(client, "first"))
+            await asyncio.sleep(0.01)
+            waiting = [asyncio.create_task(send(client, f"new-{i}")) for i in range(3)]
+            await asyncio.sleep(0.01)
+            booking = asyncio.create_task(send(client, "booking"))
+            await asyncio.gather(first, booking, *waiting)
+
+    try:
+        asyncio.run(run())
+    finally:
+        admission.SESSIONS.pop("booking", None)
+    assert order[:2] == ["first", "booking"]
+
+
+async def fire(app, requests):
+    """Send `requests` concurrent chat turns; return (response, latency) pairs."""
+    import anyio.to_thread
+
+    # shrink the sync-endpoint threadpool so the load really exceeds capacity
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+
+    async def timed(client, i):
+        start = time.perf_counter()
+        r = await client.post("/api/chat", json={"message": "hi", "session_id": f"s{i}"})
+        return r, time.perf_counter() - start
+
+    async with httpx.AsyncClient(app=app, base_url="http://test", timeout=30) as client:
+        return await asyncio.gather(*(timed(client, i) for i in range(requests)))
+
+
+def p99(results):
+    latencies = sorted(t for _, t in results)
+    return latencies[int(len(latencies) * 0.99) - 1]
+
+
+def test_overload_keeps_p99_bounded(record_property):
+    """
+    Load test: 200 concurrent turns against an 8-thread pool (~160 turns/s),
+    i.e. more work than the pool can clear within the queue deadline.
+    p99 timings are attached to the test report; the absolute latency limits
+    are only enforced with RUN_BENCHMARKS=1 so a loaded CI box can't make the
+    suite flaky.
+    """
+    controller = AdmissionController(max_in_flight=THREADPOOL_SIZE, max_queue=40,
+                                     queue_timeout=0.2, client_burst=1000)
+    # worst admitted turn: waits out the queue deadline, then runs once
+    bound = controller.queue_timeout + SERVICE_TIME
+
+    unguarded = asyncio.run(fire(make_app(), 200))
+    guarded = asyncio.run(fire(make_app(controller), 200))
+    record_property("p99_unguarded_s", round(p99(unguarded), 3))
+    record_property("p99_guarded_s", round(p99(guarded), 3))
+
+    assert all(r.status_code == 200 for r, _ in unguarded)
+    # relative check holds however slow the machine is: both runs slow down together
+    assert p99(guarded) < p99(unguarded) / 2
+    if os.getenv("RUN_BENCHMARKS"):
+        assert p99(unguarded) > 2 * bound
+        # 10% allowance for event-loop / client overhead on top of wait + service
+        assert p99(guarded) < bound * 1.1
+
+    statuses = [r.status_code for r, _ in guarded]
+    assert statuses.count(200) >= controller.max_in_flight
+    assert statuses.count(503) > 0
+    assert all("retry-after" in r.headers for r, _ in guarded if r.status_code == 503)
+
+    metrics = controller.metrics()
+    assert metrics["in_flight"] == 0 and metrics["queue_depth"] == 0
+    assert metrics["shed"]["queue_full"] + metrics["shed"]["queue_timeout"] == statuses.count(503)
+
+
+def test_client_limit_checked_before_session_buckets():
+    controller = AdmissionController(client_rate=0.1, client_burst=1)
+    app = make_app(controller)
+
+    async def run():
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            return [await client.post("/api/chat", json={"message": "hi", "session_id": f"s{i}"})
+                    for i in range(20)]
+
+    statuses = [r.status_code for r in asyncio.run(run())]
+    assert statuses == [200] + [429] * 19
+    assert len(controller.session_buckets.buckets) == 1
+
+
+def test_bucket_registry_is_capped():
+    registry = BucketRegistry(rate=1.0, capacity=1, max_keys=3)
+    for key in ["a", "b", "c"]:
+        registry.take(key)
+    registry.take("a")  # refresh "a" so "b" is the stalest
+    registry.take("d")
+    assert list(registry.buckets) == ["c", "a", "d"]
+
+
+def test_oversized_body_returns_413():
+    controller = AdmissionController()
+    app = make_app(controller, max_body_bytes=100)
+
+    async def run():
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            return await client.post("/api/chat", json={"message": "x" * 500})
+
+    r = asyncio.run(run())
+    assert r.status_code == 413
+    assert controller.metrics()["shed"]["body_too_large"] == 1
+
+
+def test_admission_metrics_endpoint():
+    from fastapi.testclient import TestClient
+    from backend.main import app
+
+    r = TestClient(app).get("/api/metrics/admission")
+    assert r.status_code == 200
+    assert {"in_flight", "queue_depth", "shed_total"} <= r.json().keys()
+
+
+def test_retry_after_exposed_to_browser_clients():
+    from fastapi.testclient import TestClient
+    from backend.main import app
+
+    r = TestClient(app).get("/", headers={"Origin": "http://localhost:3000"})
+    assert "retry-after" in r.headers["access-control-expose-headers"].lower()
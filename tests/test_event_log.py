@@ -0,0 +1,217 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from backend.api import chat
+from backend.agent.scheduling_agent import SESSIONS
+from backend.audit import event_log as event_log_module
+from backend.audit.event_log import EventLog
+from backend.models.schemas import ChatRequest
+
+
+def read_events(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def gate_writer(log):
+    """Hold the writer thread until the returned event is set."""
+    gate = threading.Event()
+    write = log._write
+
+    def slow_write(batch):
+        gate.wait()
+        write(batch)
+
+    log._write = slow_write
+    return gate
+
+
+def test_events_flushed_on_close(tmp_path):
+    log = EventLog(log_dir=tmp_path)
+    for i in range(100):
+        log.emit("turn", session_id="s1", n=i)
+    log.close()
+
+    events = read_events(tmp_path / "events.ndjson")
+    assert [e["n"] for e in events] == list(range(100))
+    assert events[0]["event"] == "turn" and "ts" in events[0]
+    assert log.stats() == {"queued": 0, "written": 100, "dropped": 0, "write_errors": 0}
+
+
+def test_rotation_keeps_backup_count(tmp_path):
+    log = EventLog(log_dir=tmp_path, max_bytes=500, backup_count=2, batch_size=1)
+    for i in range(50):
+        log.emit("turn", n=i, padding="x" * 50)
+    log.close()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "events.ndjson", "events.ndjson.1", "events.ndjson.2"]
+    assert (tmp_path / "events.ndjson.1").stat().st_size >= 500
+
+
+def test_drop_policy_never_blocks(tmp_path):
+    log = EventLog(log_dir=tmp_path, queue_size=5, policy="drop")
+    gate = gate_writer(log)
+    start = time.perf_counter()
+    for i in range(50):
+        log.emit("turn", n=i)
+    elapsed = time.perf_counter() - start
+    gate.set()
+    log.close()
+
+    assert elapsed < 0.1
+    assert log.dropped > 0
+    assert log.written + log.dropped == 50
+
+
+def test_close_returns_when_writer_is_stuck(tmp_path):
+    log = EventLog(log_dir=tmp_path, queue_size=2, policy="drop")
+    gate = gate_writer(log)
+    log.emit("turn", n=0)
+    time.sleep(0.05)  # writer picks that up and hangs on the "disk"
+    for i in range(1, 10):
+        log.emit("turn", n=i)  # ...while the queue fills up behind it
+    assert log.stats()["queued"] == 2
+
+    start = time.perf_counter()
+    log.close(timeout=0.3)
+    elapsed = time.perf_counter() - start
+    gate.set()
+
+    assert elapsed < 1.0
+
+
+def test_concurrent_emit_and_close_account_for_every_event(tmp_path):
+    for policy in ("drop", "block"):
+        log = EventLog(log_dir=tmp_path / policy, queue_size=50, policy=policy)
+        per_thread, threads = 500, 8
+
+        def emit_many():
+            for i in range(per_thread):
+                log.emit("turn", n=i)
+
+        workers = [threading.Thread(target=emit_many) for _ in range(threads)]
+        for w in workers:
+            w.start()
+        time.sleep(0.005)
+        log.close()
+        for w in workers:
+            w.join()
+
+        stats = log.stats()
+        assert stats["queued"] == 0
+        assert stats["written"] + stats["dropped"] == per_thread * threads
+        assert len(read_events(log.path)) == stats["written"]
+
+
+def test_block_policy_waits_for_room(tmp_path):
+    log = EventLog(log_dir=tmp_path, queue_size=2, policy="block", block_timeout=5)
+    gate = gate_writer(log)
+    threading.Timer(0.1, gate.set).start()
+    for i in range(20):
+        log.emit("turn", n=i)
+    log.close()
+
+    assert log.dropped == 0
+    assert [e["n"] for e in read_events(tmp_path / "events.ndjson")] == list(range(20))
+
+
+def test_invalid_policy():
+    with pytest.raises(ValueError):
+        EventLog(policy="spill")
+
+
+def test_emit_after_close_is_dropped(tmp_path):
+    log = EventLog(log_dir=tmp_path)
+    log.emit("turn", n=1)
+    log.close()
+    log.emit("turn", n=2)
+
+    assert log._thread is None
+    assert log.stats() == {"queued": 0, "written": 1, "dropped": 1, "write_errors": 0}
+    assert [e["n"] for e in read_events(tmp_path / "events.ndjson")] == [1]
+
+
+class Unserializable:
+    def __str__(self):
+        raise RuntimeError("cannot serialize")
+
+
+def test_write_failure_keeps_writer_alive(tmp_path):
+    log = EventLog(log_dir=tmp_path, batch_size=1)
+    log.emit("turn", bad=Unserializable())
+    log.emit("turn", n=1)
+    log.close()
+
+    assert log.stats()["write_errors"] == 1
+    assert [e["n"] for e in read_events(tmp_path / "events.ndjson")] == [1]
+
+
+def test_chat_turns_are_logged(event_log):
+    sid = chat.chat_endpoint(ChatRequest(message="I need to see the doctor"))["session_id"]
+    chat.chat_endpoint(ChatRequest(message="headaches", session_id=sid))
+    chat.chat_endpoint(ChatRequest(message="consultation", session_id=sid))
+    chat.chat_endpoint(ChatRequest(message="2024-01-16", session_id=sid))
+    event_log.close()
+
+    events = read_events(event_log.path)
+    kinds = [e["event"] for e in events]
+    assert kinds.count("turn") == 4
+    assert {"from_state": "new", "to_state": "awaiting_reason"}.items() <= events[1].items()
+    tool = next(e for e in events if e["event"] == "tool_call")
+    assert tool["tool"] == "get_availability" and tool["ok"] and tool["session_id"] == sid
+    assert tool["date"] == "2024-01-16" and "args" not in tool
+
+
+def test_patient_details_are_not_logged(event_log):
+    sid = chat.chat_endpoint(ChatRequest(message="2024-01-16"))["session_id"]
+    chat.chat_endpoint(ChatRequest(message="1", session_id=sid))
+    SESSIONS[sid]["data"]["reason"] = "checkup"
+    chat.chat_endpoint(ChatRequest(message="Jane Roe, jane@example.com, 555-0100", session_id=sid))
+    event_log.close()
+
+    raw = event_log.path.read_text()
+    assert "jane@example.com" not in raw and "Jane Roe" not in raw
+    kinds = [e["event"] for e in read_events(event_log.path)]
+    assert "booking" in kinds
+    assert {"event": "tool_call", "tool": "book_slot"}.items() <= next(
+        e for e in read_events(event_log.path) if e.get("tool") == "book_slot").items()
+
+
+def test_benchmark_per_turn_overhead(tmp_path, monkeypatch, record_property):
+    """
+    Benchmark: per-turn cost of logging while the writer is stalled on "disk".
+    Timings are attached to the test report; the timing limit is only enforced
+    with RUN_BENCHMARKS=1 so a loaded CI box can't make the suite flaky.
+    """
+    turns = 2000
+
+    def run_turns():
+        start = time.perf_counter()
+        for _ in range(turns):
+            chat.chat_endpoint(ChatRequest(message="I need to see the doctor"))
+        return (time.perf_counter() - start) / turns
+
+    real_log_event = chat.log_event
+    monkeypatch.setattr(chat, "log_event", lambda *a, **kw: None)
+    baseline = run_turns()
+    monkeypatch.setattr(chat, "log_event", real_log_event)
+
+    log = EventLog(log_dir=tmp_path, queue_size=turns * 4)
+    gate = gate_writer(log)  # writer stuck on "disk": emit must not care
+    monkeypatch.setattr(event_log_module, "event_log", log)
+    logged = run_turns()
+    gate.set()
+    log.close()
+
+    added_us = (logged - baseline) * 1e6
+    record_property("baseline_us", round(baseline * 1e6, 1))
+    record_property("logged_us", round(logged * 1e6, 1))
+    record_property("added_us", round(added_us, 1))
+
+    assert log.written == turns * 2  # one turn + one state_transition each
+    if os.getenv("RUN_BENCHMARKS"):
+        assert added_us < 500